@@ -1,9 +1,11 @@
 from django.contrib import admin
-from .models import *
+from .models import CustomUser, WorkerProfile, CustomerProfile, Booking, Feedback, DeletionJob, ArchivedBooking
 # Register your models here.
 admin.site.register(CustomUser),
 admin.site.register(WorkerProfile),
 admin.site.register(CustomerProfile),
 admin.site.register(Booking),
 admin.site.register(Feedback),
+admin.site.register(DeletionJob),
+admin.site.register(ArchivedBooking),
 
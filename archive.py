@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from .models import ArchivedBooking, Booking, Feedback
+
+ARCHIVE_AFTER_DAYS = getattr(settings, "BOOKING_ARCHIVE_AFTER_DAYS", 90)
+DEFAULT_BATCH_SIZE = getattr(settings, "BOOKING_ARCHIVE_BATCH_SIZE", 500)
+FINISHED_STATUSES = ("completed", "cancelled")
+
+
+def archive_cutoff(days=None):
+    return timezone.now() - timedelta(days=ARCHIVE_AFTER_DAYS if days is None else days)
+
+
+def active_bookings(**filters):
+    """Bookings for the dashboards: everything still in the hot table.
+
+    Archiving is what bounds this set. Filtering by date here as well would
+    hide finished bookings that the archive job hasn't moved yet, leaving them
+    on neither the dashboard nor the history page.
+    """
+    return Booking.objects.filter(**filters)
+
+
+def archive_batch(cutoff, batch_size=DEFAULT_BATCH_SIZE):
+    """Move one batch of finished bookings older than ``cutoff``. Returns the count."""
+    with transaction.atomic():
+        bookings = list(
+            Booking.objects.filter(status__in=FINISHED_STATUSES, date__lt=cutoff)
+            .select_related("feedback")
+            .order_by("id")[:batch_size]
+        )
+        if not bookings:
+            return 0
+        archived = []
+        for booking in bookings:
+            feedback = getattr(booking, "feedback", None)
+            archived.append(ArchivedBooking(
+                id=booking.id,
+                worker_id=booking.worker_id,
+                customer_id=booking.customer_id,
+                service=booking.service,
+                date=booking.date,
+                status=booking.status,
+                notes=booking.notes,
+                duration_hours=booking.duration_hours,
+                quoted_total=booking.quoted_total,
+                feedback_rating=feedback.rating if feedback else None,
+                feedback_comment=feedback.comment if feedback else None,
+            ))
+        ArchivedBooking.objects.bulk_create(archived)
+        booking_ids = [booking.id for booking in bookings]
+        Feedback.objects.filter(booking_id__in=booking_ids).delete()
+        Booking.objects.filter(id__in=booking_ids).delete()
+    return len(bookings)
+
+
+def archive_old_bookings(days=None, batch_size=DEFAULT_BATCH_SIZE, max_batches=None):
+    cutoff = archive_cutoff(days)
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = archive_batch(cutoff, batch_size)
+        if not count:
+            break
+        moved += count
+        batches += 1
+    return moved
+
+
+def _rating_subquery(queryset, group_field, aggregate):
+    return Coalesce(
+        Subquery(queryset.values(group_field).annotate(value=aggregate).values("value")[:1]),
+        Value(0),
+    )
+
+
+def with_avg_rating(workers):
+    """Annotate WorkerProfiles with ``avg_rating`` over live and archived feedback."""
+    live = Feedback.objects.filter(booking__worker=OuterRef("user"))
+    archived = ArchivedBooking.objects.filter(worker=OuterRef("user"), feedback_rating__isnull=False)
+    total = (
+        _rating_subquery(live, "booking__worker", Sum("rating"))
+        + _rating_subquery(archived, "worker", Sum("feedback_rating"))
+    )
+    count = (
+        _rating_subquery(live, "booking__worker", Count("id"))
+        + _rating_subquery(archived, "worker", Count("id"))
+    )
+    return workers.annotate(avg_rating=Cast(total, FloatField()) / NullIf(count, Value(0)))
+
+
+def worker_avg_rating(worker):
+    live = Feedback.objects.filter(booking__worker=worker).aggregate(total=Sum("rating"), count=Count("id"))
+    archived = ArchivedBooking.objects.filter(worker=worker, feedback_rating__isnull=False).aggregate(
+        total=Sum("feedback_rating"), count=Count("id")
+    )
+    count = live["count"] + archived["count"]
+    if not count:
+        return None
+    return ((live["total"] or 0) + (archived["total"] or 0)) / count
@@ -0,0 +1,133 @@
+import gzip
+import re
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+# Each page gets base.css plus its own stylesheet. Page stylesheets style bare
+# elements (form, button, ...), so they can't all be merged into one site bundle.
+CSS_BUNDLES = {
+    "base": ["css/base.css"],
+    "home": ["css/base.css", "css/home.css"],
+    "booking": ["css/base.css", "css/booking.css"],
+    "login": ["css/base.css", "css/login.css"],
+    "register": ["css/base.css", "css/register.css"],
+    "workerprofile": ["css/base.css", "css/workerprofile.css"],
+}
+
+IMAGE_DIR = "image"
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+class ForgivingManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Fall back to the unhashed URL for service images that were never collected.
+
+    Several templates point at images that may not be shipped; with the stock
+    storage that turns the whole page into a 500 once DEBUG is off. Anything
+    else missing, a CSS bundle in particular, still raises.
+    """
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            if name.startswith(f"{IMAGE_DIR}/"):
+                return name
+            raise
+
+
+def bundle_path(name):
+    return f"css/dist/{name}.min.css"
+
+
+def source_dirs():
+    build_dir = Path(settings.ASSET_BUILD_DIR)
+    return [Path(d) for d in settings.STATICFILES_DIRS if Path(d) != build_dir]
+
+
+def find_source(relative_path):
+    for directory in source_dirs():
+        candidate = directory / relative_path
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"Static source not found: {relative_path}")
+
+
+def minify_css(text):
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+    text = re.sub(r":\s+", ":", text)
+    text = text.replace(";}", "}")
+    return text.strip()
+
+
+def compressed_sizes(data):
+    try:
+        import brotli
+    except ImportError:  # optional, only used for size reporting
+        brotli = None
+    return {
+        "raw": len(data),
+        "gzip": len(gzip.compress(data, compresslevel=9)),
+        "brotli": len(brotli.compress(data)) if brotli else None,
+    }
+
+
+def build_css_bundles(out_dir):
+    """Write one minified bundle per entry in CSS_BUNDLES, return size stats."""
+    report = []
+    for name, sources in CSS_BUNDLES.items():
+        parts = [find_source(path).read_text(encoding="utf-8") for path in sources]
+        minified = minify_css("\n".join(parts)).encode("utf-8")
+        target = Path(out_dir) / bundle_path(name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(minified)
+        sizes = compressed_sizes(minified)
+        sizes["source"] = sum(len(part.encode("utf-8")) for part in parts)
+        report.append((bundle_path(name), sizes))
+    return report
+
+
+def optimize_images(out_dir, max_width=None):
+    """Downscale and re-encode service images, keeping the same static path.
+
+    Only copies that come out smaller are written, so the original is served
+    whenever re-encoding doesn't help.
+    """
+    from PIL import Image
+
+    max_width = max_width or settings.ASSET_IMAGE_MAX_WIDTH
+    report = []
+    for directory in source_dirs():
+        for source in sorted((directory / IMAGE_DIR).glob("*")):
+            if source.suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+            relative = source.relative_to(directory)
+            target = Path(out_dir) / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with Image.open(source) as image:
+                image.thumbnail((max_width, max_width * 4))
+                if source.suffix.lower() == ".png":
+                    image.save(target, optimize=True)
+                else:
+                    image.convert("RGB").save(
+                        target, "JPEG", quality=80, optimize=True, progressive=True
+                    )
+            before, after = source.stat().st_size, target.stat().st_size
+            if after >= before:
+                target.unlink()
+                after = before
+            report.append((str(relative), {"raw": before, "optimized": after}))
+    return report
+
+
+def build(out_dir=None):
+    out_dir = Path(out_dir or settings.ASSET_BUILD_DIR)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+    return build_css_bundles(out_dir), optimize_images(out_dir)
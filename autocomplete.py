@@ -0,0 +1,177 @@
+import threading
+import time
+import uuid
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import WorkerProfile
+
+MAX_TERMS = getattr(settings, "AUTOCOMPLETE_MAX_TERMS", 50000)
+# How often a process checks the generation token in the shared cache (see
+# CACHES in settings), and the longest it serves an index without rebuilding.
+SYNC_INTERVAL = getattr(settings, "AUTOCOMPLETE_SYNC_INTERVAL", 5)
+MAX_AGE = getattr(settings, "AUTOCOMPLETE_MAX_AGE", 300)
+GENERATION_KEY = "autocomplete:generation"
+MAX_SCAN = 200
+
+
+def normalize(text):
+    return " ".join(text.split()).casefold()
+
+
+def worker_terms(service_type, location, username):
+    terms = []
+    for kind, label in (("service", service_type), ("location", location), ("worker", username)):
+        if label and label.strip():
+            terms.append((normalize(label), kind, " ".join(label.split())))
+    return terms
+
+
+class PrefixIndex:
+    """Sorted array of normalized terms searched with bisect.
+
+    Terms are reference counted per worker so a single profile update can be
+    applied without rebuilding; ``_keys`` holds ``(term, kind)`` pairs in sort
+    order and ``_labels`` their display form.
+    """
+
+    def __init__(self, max_terms=MAX_TERMS):
+        self.max_terms = max_terms
+        self._keys = []
+        self._labels = {}
+        self._counts = {}
+        self._by_worker = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _add(self, term, kind, label):
+        key = (term, kind)
+        if key in self._counts:
+            self._counts[key] += 1
+            return True
+        if len(self._keys) >= self.max_terms:
+            return False
+        self._counts[key] = 1
+        self._labels[key] = label
+        insort(self._keys, key)
+        return True
+
+    def _remove(self, term, kind):
+        key = (term, kind)
+        self._counts[key] -= 1
+        if self._counts[key]:
+            return
+        del self._counts[key]
+        del self._labels[key]
+        del self._keys[bisect_left(self._keys, key)]
+
+    def set_worker(self, worker_id, terms):
+        """Replace ``worker_id``'s terms. Returns False if they were already indexed."""
+        terms = tuple(terms)
+        with self._lock:
+            if self._by_worker.get(worker_id, ()) == terms:
+                return False
+            for term, kind, label in self._by_worker.pop(worker_id, ()):
+                self._remove(term, kind)
+            added = tuple((term, kind, label) for term, kind, label in terms if self._add(term, kind, label))
+            if added:
+                self._by_worker[worker_id] = added
+            return True
+
+    def remove_worker(self, worker_id):
+        self.set_worker(worker_id, ())
+
+    def search(self, prefix, limit=8):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        start = bisect_left(self._keys, (prefix,))
+        matches = []
+        for key in self._keys[start:start + MAX_SCAN]:
+            if not key[0].startswith(prefix):
+                break
+            matches.append(key)
+        # Most widely used terms first, e.g. a service offered by many workers.
+        matches.sort(key=lambda key: -self._counts.get(key, 0))
+        return [{"label": self._labels[key], "kind": key[1]} for key in matches[:limit] if key in self._labels]
+
+
+class WorkerAutocomplete:
+    """Per-process index over active worker profiles.
+
+    Saves in this process update the index in place (see signals.py) and write
+    a new generation token to the Django cache; every process, this one
+    included, notices it within SYNC_INTERVAL and rebuilds from the database.
+    """
+
+    def __init__(self):
+        self.index = None
+        self.generation = None
+        self.built_at = 0
+        self.checked_at = 0
+        self._build_lock = threading.Lock()
+
+    def build(self):
+        index = PrefixIndex()
+        rows = WorkerProfile.objects.filter(user__is_active=True).values_list(
+            "id", "service_type", "location", "user__username"
+        )
+        # Read the generation first: a bump that lands during the scan then
+        # triggers another rebuild instead of being missed.
+        generation = cache.get(GENERATION_KEY)
+        for worker_id, service_type, location, username in rows.iterator():
+            index.set_worker(worker_id, worker_terms(service_type, location, username))
+        self.generation = generation
+        self.index = index
+        self.built_at = self.checked_at = time.monotonic()
+        return index
+
+    def _current(self):
+        now = time.monotonic()
+        if self.index is not None and now - self.checked_at < SYNC_INTERVAL:
+            return self.index
+        with self._build_lock:
+            self.checked_at = now
+            if (
+                self.index is None
+                or now - self.built_at > MAX_AGE
+                or cache.get(GENERATION_KEY) != self.generation
+            ):
+                self.build()
+        return self.index
+
+    def suggest(self, prefix, limit=8):
+        return self._current().search(prefix, limit)
+
+    def _bump_generation(self):
+        # A fresh token rather than cache.incr: incr isn't atomic on every backend
+        # (two processes can both write n + 1) and resets the timeout. This
+        # process doesn't adopt the token either, so it rebuilds on its next
+        # check and picks up any change that raced with its own.
+        cache.set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+    def update_worker(self, profile):
+        if profile.user.is_active:
+            terms = worker_terms(profile.service_type, profile.location, profile.user.username)
+        else:
+            terms = ()
+        changed = self.index is None or self.index.set_worker(profile.pk, terms)
+        # An unchanged index entry only proves nothing changed if the index is
+        # current; otherwise another process may have indexed different terms.
+        if not changed and cache.get(GENERATION_KEY) == self.generation:
+            return
+        # Other processes rebuild from the database, so only signal them once it's committed.
+        transaction.on_commit(self._bump_generation)
+
+    def remove_worker(self, worker_id):
+        if self.index is not None:
+            self.index.remove_worker(worker_id)
+        transaction.on_commit(self._bump_generation)
+
+
+worker_index = WorkerAutocomplete()
@@ -0,0 +1,101 @@
+"""Cold-start benchmark for web workers.
+
+For each settings profile, starts fresh interpreters and measures:
+
+* import time, via ``python -X importtime``, summed per top-level package;
+* time to first response: interpreter start, importing backend.wsgi and
+  serving one request through the WSGI callable.
+
+Run from the project root:
+
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --path /api/ --budget-ms 400
+
+With --budget-ms the script exits non-zero when the median time to first
+response of any profile goes over budget, so it can gate CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FIRST_RESPONSE = """
+import sys, time
+from io import BytesIO
+from backend.wsgi import application
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": sys.argv[1], "QUERY_STRING": "",
+    "SERVER_NAME": "localhost", "SERVER_PORT": "80", "HTTP_HOST": "localhost",
+    "wsgi.url_scheme": "http", "wsgi.input": BytesIO(), "wsgi.errors": sys.stderr,
+}
+status = []
+body = b"".join(application(environ, lambda s, h, exc_info=None: status.append(s)))
+print(status[0])
+"""
+
+
+def run(settings_module, args):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module, PYTHONPATH=str(ROOT))
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return (time.perf_counter() - started) * 1000, result
+
+
+def import_profile(settings_module):
+    _, result = run(settings_module, ["-X", "importtime", "-c", "import backend.wsgi"])
+    packages = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, _, name = line.split("|")
+        self_time = self_time.replace("import time:", "").strip()
+        # Self time summed per top-level package, so nothing is counted twice.
+        if self_time.isdigit():
+            packages[name.strip().split(".")[0]] += int(self_time)
+    return packages
+
+
+def first_response(settings_module, path, runs):
+    timings = []
+    for _ in range(runs):
+        elapsed, result = run(settings_module, ["-c", FIRST_RESPONSE, path])
+        timings.append(elapsed)
+    return timings, result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--settings", action="append",
+                        help="Settings module(s) to compare (default: backend.settings and backend.settings_web).")
+    parser.add_argument("--path", default="/api/", help="Request path for the first response.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    options = parser.parse_args()
+
+    over_budget = False
+    for settings_module in options.settings or ["backend.settings", "backend.settings_web"]:
+        packages = import_profile(settings_module)
+        timings, status = first_response(settings_module, options.path, options.runs)
+        median = statistics.median(timings)
+        print(f"\n{settings_module}")
+        print(f"  imports: {sum(packages.values()) / 1000:.1f} ms")
+        for name, micros in packages.most_common(options.top):
+            print(f"    {micros / 1000:8.1f} ms  {name}")
+        print(f"  first response ({status}): median {median:.0f} ms, min {min(timings):.0f} ms over {options.runs} runs")
+        if options.budget_ms is not None and median > options.budget_ms:
+            print(f"  over budget ({options.budget_ms:.0f} ms)")
+            over_budget = True
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
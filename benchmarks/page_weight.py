@@ -0,0 +1,85 @@
+"""Page weight and first-load benchmark.
+
+Renders pages through the full middleware stack and fetches every same-origin
+stylesheet, script and image they reference, the way a browser with an empty
+cache would. Each page is measured twice on the production path (DEBUG off, so
+collected, fingerprinted and pre-compressed files): once linking the source
+stylesheets and once linking the minified bundles. Run from the project root,
+after `manage.py build_assets --collect`:
+
+    python benchmarks/page_weight.py /api/ /api/login/
+"""
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.test import Client, override_settings
+
+ASSET_RE = re.compile(r'<(?:link|script|img)\b[^>]*?(?:href|src)="([^"]+)"')
+PROFILES = (("unbundled", False), ("bundled", True))
+
+
+def body_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure(client, path):
+    started = time.perf_counter()
+    page = client.get(path, HTTP_ACCEPT_ENCODING="br, gzip")
+    html = page.content.decode("utf-8", "replace")
+    rows = [(path, page.status_code, len(page.content), page.get("Content-Encoding", ""))]
+    external = []
+    for url in dict.fromkeys(ASSET_RE.findall(html)):
+        if not url.startswith(settings.STATIC_URL):
+            external.append(url)
+            continue
+        asset = client.get(url, HTTP_ACCEPT_ENCODING="br, gzip")
+        rows.append((url, asset.status_code, body_size(asset), asset.get("Content-Encoding", "")))
+    elapsed = (time.perf_counter() - started) * 1000
+    return rows, external, elapsed
+
+
+def report(label, rows, external, elapsed):
+    loaded = [row for row in rows if row[1] == 200]
+    failed = [row for row in rows if row[1] != 200]
+    total = sum(row[2] for row in loaded)
+    print(f"  {label}")
+    for url, status, size, encoding in loaded:
+        print(f"    {status} {size:>9} B  {encoding or '-':<4} {url}")
+    print(f"    total {total} B in {len(loaded)} request(s), {elapsed:.1f} ms")
+    # Error pages aren't page weight; list them so missing assets get noticed.
+    for url, status, size, encoding in failed:
+        print(f"    failed ({status}, not counted): {url}")
+    for url in external:
+        print(f"    external (not counted): {url}")
+    return total
+
+
+def main(paths):
+    if not (Path(settings.STATIC_ROOT) / "staticfiles.json").exists():
+        sys.exit("No collected static files; run `python manage.py build_assets --collect` first.")
+    for path in paths or ["/api/"]:
+        print(f"\n{path}")
+        totals = {}
+        for label, bundles in PROFILES:
+            # A fresh Client per profile: WhiteNoise reads DEBUG when the middleware is built.
+            with override_settings(DEBUG=False, ASSET_BUNDLES=bundles):
+                totals[label] = report(label, *measure(Client(), path))
+        saved = totals["unbundled"] - totals["bundled"]
+        print(f"  bundling saves {saved} B ({saved / max(totals['unbundled'], 1):.0%})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,91 @@
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ArchivedBooking, Booking, CustomerProfile, DeletionJob, Feedback, WorkerProfile
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+DEFAULT_BATCH_SIZE = getattr(settings, "DELETION_BATCH_SIZE", 500)
+
+
+def schedule_user_deletion(user):
+    """Soft-delete ``user`` right away and queue the purge of their data.
+
+    Deactivating the account logs the user out, blocks new logins and hides
+    their worker profile from listings; the rows themselves are removed later
+    by ``purge_deleted_accounts`` in bounded batches.
+    """
+    with transaction.atomic():
+        if user.is_active:
+            user.is_active = False
+            user.save(update_fields=["is_active"])
+        job, _ = DeletionJob.objects.get_or_create(
+            user_id=user.pk, defaults={"username": user.username}
+        )
+    return job
+
+
+def purge_batch(job, batch_size=DEFAULT_BATCH_SIZE):
+    """Delete one batch of the user's bookings. Returns True once finished.
+
+    Each batch runs in its own short transaction together with the progress
+    update, so a crash loses at most the batch in flight and the next run
+    resumes from ``job.last_booking_id``.
+    """
+    with transaction.atomic():
+        booking_ids = list(
+            Booking.objects.filter(
+                Q(worker_id=job.user_id) | Q(customer_id=job.user_id),
+                id__gt=job.last_booking_id,
+            )
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if booking_ids:
+            Feedback.objects.filter(booking_id__in=booking_ids).delete()
+            Booking.objects.filter(id__in=booking_ids).delete()
+            job.last_booking_id = booking_ids[-1]
+            job.bookings_purged += len(booking_ids)
+            job.status = "running"
+            job.save(update_fields=["last_booking_id", "bookings_purged", "status", "updated_at"])
+            return False
+
+        archived_ids = list(
+            ArchivedBooking.objects.filter(Q(worker_id=job.user_id) | Q(customer_id=job.user_id))
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if archived_ids:
+            ArchivedBooking.objects.filter(id__in=archived_ids).delete()
+            job.bookings_purged += len(archived_ids)
+            job.status = "running"
+            job.save(update_fields=["bookings_purged", "status", "updated_at"])
+            return False
+
+        # Nothing left that references the user, so the final delete is cheap.
+        WorkerProfile.objects.filter(user_id=job.user_id).delete()
+        CustomerProfile.objects.filter(user_id=job.user_id).delete()
+        User.objects.filter(pk=job.user_id).delete()
+        job.status = "done"
+        job.completed_at = timezone.now()
+        job.save(update_fields=["status", "completed_at", "updated_at"])
+    return True
+
+
+def purge_pending_jobs(batch_size=DEFAULT_BATCH_SIZE, max_batches=None):
+    """Work through every unfinished deletion job, oldest first."""
+    batches = 0
+    for job in DeletionJob.objects.exclude(status="done").order_by("created_at"):
+        while max_batches is None or batches < max_batches:
+            batches += 1
+            if purge_batch(job, batch_size):
+                logger.info("Purged account %s (%s bookings)", job.username, job.bookings_purged)
+                break
+        else:
+            break
+    return batches
@@ -0,0 +1,137 @@
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import BookingEvent
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SIZE = getattr(settings, "BOOKING_EVENT_FLUSH_SIZE", 100)
+FLUSH_INTERVAL = getattr(settings, "BOOKING_EVENT_FLUSH_INTERVAL", 2.0)
+# Events kept in memory while the database is unavailable, oldest dropped first.
+MAX_BUFFERED = getattr(settings, "BOOKING_EVENT_MAX_BUFFERED", 10000)
+
+
+class EventBuffer:
+    """Collects events in memory and writes them with one bulk insert per flush.
+
+    A daemon thread flushes every FLUSH_INTERVAL seconds, or sooner once
+    FLUSH_SIZE events are waiting, so requests never wait on the insert. The
+    thread is (re)started lazily per process, which keeps it working in
+    gunicorn workers forked from a preloaded master.
+    """
+
+    def __init__(self):
+        self._events = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def append(self, event):
+        with self._lock:
+            self._events.append(event)
+            pending = len(self._events)
+        self._ensure_thread()
+        if pending >= FLUSH_SIZE:
+            self._wakeup.set()
+
+    def flush(self):
+        with self._lock:
+            events, self._events = self._events, []
+        if not events:
+            return 0
+        try:
+            BookingEvent.objects.bulk_create(events)
+        except Exception:
+            logger.exception("Writing %s booking event(s) failed, will retry", len(events))
+            with self._lock:
+                self._events[:0] = events
+                del self._events[:-MAX_BUFFERED]
+            return 0
+        return len(events)
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="booking-events", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self.flush()
+            close_old_connections()
+
+
+event_buffer = EventBuffer()
+atexit.register(event_buffer.flush)
+
+
+def record_booking_event(booking, actor, from_status=""):
+    """Log ``booking``'s move from ``from_status`` to its current status.
+
+    Queued only once the surrounding transaction commits, so a rolled back
+    status change never shows up in the log.
+    """
+    event = BookingEvent(
+        booking_id=booking.pk,
+        actor_id=actor.pk if actor is not None else None,
+        worker_id=booking.worker_id,
+        customer_id=booking.customer_id,
+        service=booking.service,
+        scheduled_for=booking.date,
+        from_status=from_status,
+        to_status=booking.status,
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: event_buffer.append(event))
+
+
+def booking_events(booking_id):
+    return BookingEvent.objects.filter(booking_id=booking_id).order_by("created_at", "id")
+
+
+def replay_booking(booking_id):
+    """Rebuild a booking's lifecycle from the log alone, or None if it has no events."""
+    state = None
+    for event in booking_events(booking_id):
+        if state is None:
+            state = {
+                "booking_id": booking_id,
+                "created_at": event.created_at,
+                "created_by": event.actor_id,
+                "history": [],
+            }
+        state["worker_id"] = event.worker_id
+        state["customer_id"] = event.customer_id
+        state["service"] = event.service
+        state["scheduled_for"] = event.scheduled_for
+        state["status"] = event.to_status
+        state["updated_at"] = event.created_at
+        state["updated_by"] = event.actor_id
+        state["history"].append((event.created_at, event.actor_id, event.from_status, event.to_status))
+    return state
+
+
+def iter_events(after_id=0, batch_size=1000):
+    """Yield every event with an id above ``after_id``, in id order, batch by batch.
+
+    Analytics jobs keep the last id they saw and resume from it on the next run.
+    """
+    while True:
+        batch = list(BookingEvent.objects.filter(id__gt=after_id).order_by("id")[:batch_size])
+        if not batch:
+            return
+        yield from batch
+        after_id = batch[-1].id
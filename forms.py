@@ -73,11 +73,12 @@ class WorkerProfileForm(forms.ModelForm):
 class BookingForm(forms.ModelForm):
     class Meta:
         model = Booking
-        fields = ['service', 'date', 'notes']
+        fields = ['service', 'date', 'duration_hours', 'notes']
 
         widgets = {
             'service': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Service required'}),
             'date': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
+            'duration_hours': forms.NumberInput(attrs={'class': 'form-control', 'min': 1, 'max': 24}),
             'notes': forms.Textarea(attrs={'rows': 3, 'class': 'form-control', 'placeholder': 'Additional notes'}),
         }
 
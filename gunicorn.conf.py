@@ -0,0 +1,11 @@
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings_web')
+
+wsgi_app = 'backend.wsgi:application'
+# Import Django and the app once in the master; workers fork with it already
+# loaded, so a scale-out only pays for the fork.
+preload_app = True
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
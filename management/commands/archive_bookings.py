@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.archive import ARCHIVE_AFTER_DAYS, DEFAULT_BATCH_SIZE, archive_old_bookings
+
+
+class Command(BaseCommand):
+    help = "Move completed and cancelled bookings older than N days into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        moved = archive_old_bookings(options["days"], options["batch_size"], options["max_batches"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} booking(s)."))
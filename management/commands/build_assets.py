@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finder
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from core.assets import build
+
+
+class Command(BaseCommand):
+    help = "Bundle and minify CSS and optimize images into ASSET_BUILD_DIR."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--collect",
+            action="store_true",
+            help="Run collectstatic afterwards to fingerprint and gzip/brotli-compress the output.",
+        )
+
+    def handle(self, *args, **options):
+        bundles, images = build()
+        for path, sizes in bundles:
+            brotli_size = sizes["brotli"] if sizes["brotli"] is not None else "-"
+            self.stdout.write(
+                f"{path}: {sizes['source']} B source -> {sizes['raw']} B minified, "
+                f"{sizes['gzip']} B gzip, {brotli_size} B brotli"
+            )
+        for path, sizes in images:
+            self.stdout.write(f"{path}: {sizes['raw']} B -> {sizes['optimized']} B")
+        if options["collect"]:
+            build_dir = Path(settings.ASSET_BUILD_DIR)
+            if build_dir not in map(Path, settings.STATICFILES_DIRS):
+                # First build: the directory didn't exist when settings were loaded.
+                settings.STATICFILES_DIRS = [build_dir, *settings.STATICFILES_DIRS]
+                get_finder.cache_clear()
+            call_command("collectstatic", interactive=False, verbosity=options["verbosity"])
+        self.stdout.write(self.style.SUCCESS("Assets built."))
@@ -0,0 +1,28 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.events import iter_events
+
+
+class Command(BaseCommand):
+    help = "Write booking events as JSON lines, for analytics. Resume with --after-id."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--after-id", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for event in iter_events(options["after_id"], options["batch_size"]):
+            self.stdout.write(json.dumps({
+                "id": event.id,
+                "booking_id": event.booking_id,
+                "actor_id": event.actor_id,
+                "worker_id": event.worker_id,
+                "customer_id": event.customer_id,
+                "service": event.service,
+                "scheduled_for": event.scheduled_for.isoformat() if event.scheduled_for else None,
+                "from": event.from_status,
+                "to": event.to_status,
+                "at": event.created_at.isoformat(),
+            }))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.deletion import DEFAULT_BATCH_SIZE, purge_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Purge soft-deleted accounts in bounded batches. Safe to re-run after a crash."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches; the next run picks up where this one left off.",
+        )
+
+    def handle(self, *args, **options):
+        batches = purge_pending_jobs(options["batch_size"], options["max_batches"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {batches} batch(es)."))
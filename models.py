@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
 
 
 # Custom User
@@ -63,6 +64,10 @@ class Booking(models.Model):
         default='pending'
     )
     notes = models.TextField(blank=True, null=True)
+    duration_hours = models.PositiveSmallIntegerField(
+        default=1, validators=[MinValueValidator(1), MaxValueValidator(24)]
+    )
+    quoted_total = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
 
     def __str__(self):
         return f"{self.customer.username} → {self.worker.username} ({self.service})"
@@ -77,3 +82,72 @@ class Feedback(models.Model):
     def __str__(self):
         return f"Feedback for {self.booking}"
 
+
+
+# Account Deletion
+class DeletionJob(models.Model):
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+    )
+    # Plain ids instead of foreign keys: the job has to outlive the user it purges.
+    user_id = models.BigIntegerField(unique=True)
+    username = models.CharField(max_length=150)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    last_booking_id = models.BigIntegerField(default=0)
+    bookings_purged = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Deletion of {self.username} ({self.status})"
+
+
+# Booking Archive
+class ArchivedBooking(models.Model):
+    # Same id as the Booking it replaces, so references to it stay meaningful.
+    id = models.BigIntegerField(primary_key=True)
+    worker = models.ForeignKey(CustomUser, related_name="archived_bookings", on_delete=models.CASCADE)
+    customer = models.ForeignKey(CustomUser, related_name="archived_customer_bookings", on_delete=models.CASCADE)
+    service = models.CharField(max_length=100)
+    date = models.DateTimeField()
+    status = models.CharField(max_length=20)
+    notes = models.TextField(blank=True, null=True)
+    duration_hours = models.PositiveSmallIntegerField(default=1)
+    quoted_total = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    # Feedback is folded in; the Feedback row goes away with the hot Booking.
+    feedback_rating = models.IntegerField(blank=True, null=True)
+    feedback_comment = models.TextField(blank=True, null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["customer", "-date"]),
+            models.Index(fields=["worker", "-date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.customer.username} → {self.worker.username} ({self.service}, archived)"
+
+
+# Booking Event Log
+class BookingEvent(models.Model):
+    # Append-only. Plain ids so the history outlives archived and purged bookings.
+    booking_id = models.BigIntegerField()
+    actor_id = models.BigIntegerField(blank=True, null=True)
+    # Copied onto every row so replay and analytics never need the Booking table.
+    worker_id = models.BigIntegerField(blank=True, null=True)
+    customer_id = models.BigIntegerField(blank=True, null=True)
+    service = models.CharField(max_length=100, blank=True)
+    scheduled_for = models.DateTimeField(blank=True, null=True)
+    from_status = models.CharField(max_length=20, blank=True)
+    to_status = models.CharField(max_length=20)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["booking_id", "created_at"])]
+
+    def __str__(self):
+        return f"Booking {self.booking_id}: {self.from_status or '-'} → {self.to_status}"
@@ -0,0 +1,117 @@
+from collections import namedtuple
+from decimal import Decimal
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Booking, WorkerProfile
+
+NIGHT_MULTIPLIER = Decimal(str(getattr(settings, "PRICING_NIGHT_MULTIPLIER", "1.25")))
+WEEKEND_MULTIPLIER = Decimal(str(getattr(settings, "PRICING_WEEKEND_MULTIPLIER", "1.20")))
+# Local hours charged at the night rate: [NIGHT_START, 24) and [0, NIGHT_END).
+NIGHT_START = getattr(settings, "PRICING_NIGHT_START", 20)
+NIGHT_END = getattr(settings, "PRICING_NIGHT_END", 7)
+# Demand factor = 1 + DEMAND_STEP * (pending bookings per active worker), capped.
+DEMAND_STEP = Decimal(str(getattr(settings, "PRICING_DEMAND_STEP", "0.10")))
+DEMAND_CAP = Decimal(str(getattr(settings, "PRICING_DEMAND_CAP", "1.50")))
+DEMAND_CACHE_KEY = "pricing:demand"
+DEMAND_TTL = getattr(settings, "PRICING_DEMAND_TTL", 60)
+MAX_HOURS = 24
+
+Quote = namedtuple("Quote", "rate hours time_factor demand_factor total")
+
+
+def _market(service_type, location):
+    return ((service_type or "").strip().casefold(), (location or "").strip().casefold())
+
+
+def _counts_by_market(rows):
+    counts = {}
+    for service_type, location, count in rows:
+        market = _market(service_type, location)
+        counts[market] = counts.get(market, 0) + count
+    return counts
+
+
+@lru_cache(maxsize=1)
+def weekly_multipliers():
+    """Time-of-day x weekend multiplier for each hour of the week, Monday 00:00 first."""
+    table = []
+    for weekday in range(7):
+        for hour in range(24):
+            multiplier = Decimal(1)
+            if hour >= NIGHT_START or hour < NIGHT_END:
+                multiplier *= NIGHT_MULTIPLIER
+            if weekday >= 5:
+                multiplier *= WEEKEND_MULTIPLIER
+            table.append(multiplier)
+    return tuple(table)
+
+
+def time_factor(start, hours):
+    """Sum of hourly multipliers for a booking of ``hours`` starting at ``start``."""
+    start = timezone.localtime(start) if timezone.is_aware(start) else start
+    table = weekly_multipliers()
+    first = start.weekday() * 24 + start.hour
+    return sum(table[(first + offset) % len(table)] for offset in range(hours))
+
+
+def demand_factors():
+    """Demand factor per (service_type, location), from current pending bookings.
+
+    Two grouped queries, cached for DEMAND_TTL seconds and shared by every quote
+    in that window.
+    """
+    factors = cache.get(DEMAND_CACHE_KEY)
+    if factors is not None:
+        return factors
+    pending = _counts_by_market(
+        Booking.objects.filter(status="pending", worker__is_active=True, worker__workerprofile__isnull=False)
+        .values_list("worker__workerprofile__service_type", "worker__workerprofile__location")
+        .annotate(count=Count("id"))
+    )
+    workers = _counts_by_market(
+        WorkerProfile.objects.filter(user__is_active=True)
+        .values_list("service_type", "location")
+        .annotate(count=Count("id"))
+    )
+    factors = {}
+    for market, count in pending.items():
+        per_worker = Decimal(count) / max(workers.get(market, 0), 1)
+        factors[market] = min(DEMAND_CAP, 1 + DEMAND_STEP * per_worker)
+    cache.set(DEMAND_CACHE_KEY, factors, DEMAND_TTL)
+    return factors
+
+
+def _quote(rate, hours, hours_factor, demand):
+    total = (rate * hours_factor * demand).quantize(Decimal("0.01"))
+    return Quote(rate, hours, hours_factor, demand, total)
+
+
+def quote_many(workers, start=None, hours=1):
+    """Quote every worker for the same slot in one pass: {worker id: Quote}.
+
+    The time factor and demand table are computed once for the whole list, so
+    this costs at most two queries however many workers are listed. Workers
+    without an hourly rate are left out.
+    """
+    hours = max(1, min(int(hours), MAX_HOURS))
+    hours_factor = time_factor(start or timezone.now(), hours)
+    factors = demand_factors()
+    return {
+        worker.id: _quote(
+            worker.hourly_rate,
+            hours,
+            hours_factor,
+            factors.get(_market(worker.service_type, worker.location), Decimal(1)),
+        )
+        for worker in workers
+        if worker.hourly_rate
+    }
+
+
+def quote(worker, start=None, hours=1):
+    return quote_many([worker], start, hours).get(worker.id)
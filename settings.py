@@ -37,21 +37,23 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'corsheaders',
     'core',
     'rest_framework',
     'rest_framework_simplejwt',
 ]
 
 MIDDLEWARE = [
-   'corsheaders.middleware.CorsMiddleware',
-    'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Directly after SecurityMiddleware, so static requests skip the rest of the stack.
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    "whitenoise.middleware.WhiteNoiseMiddleware",
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -114,6 +116,16 @@ EMAIL_HOST_PASSWORD = "ekfl jcod lyxj jqnv"  #
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 
+# Shared by every process on the host, so gunicorn workers see each other's
+# autocomplete generation bumps and the cached pricing demand table.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    }
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -131,6 +143,11 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / "static"]
+# Output of `manage.py build_assets` (CSS bundles, optimized images). Listed first so
+# optimized copies shadow the originals in static/.
+ASSET_BUILD_DIR = BASE_DIR / "static_build"
+if ASSET_BUILD_DIR.exists():
+    STATICFILES_DIRS.insert(0, ASSET_BUILD_DIR)
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / "media"
@@ -140,6 +157,23 @@ DEBUG = True
 ALLOWED_HOSTS = ["*"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# collectstatic fingerprints every file (served with far-future cache headers) and
+# writes .gz/.br siblings; brotli output needs the Brotli package.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "core.assets.ForgivingManifestStaticFilesStorage",
+    },
+}
+# Look up files missing from the manifest instead of raising; only missing images are
+# then let through unhashed (see ForgivingManifestStaticFilesStorage).
+WHITENOISE_MANIFEST_STRICT = False
+# Link the minified bundles instead of the individual source stylesheets.
+ASSET_BUNDLES = not DEBUG
+ASSET_IMAGE_MAX_WIDTH = 320
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
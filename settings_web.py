@@ -0,0 +1,20 @@
+"""
+Lean settings for the gunicorn web workers.
+
+Web workers serve the HTML views and the admin. Django REST framework,
+simplejwt and CORS are left to the full profile (backend.settings), which
+manage.py keeps using. simplejwt alone pulls in django.test at import time.
+Run `python benchmarks/cold_start.py` to compare both profiles.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+WEB_EXCLUDED_APPS = (
+    'corsheaders',
+    'rest_framework',
+    'rest_framework_simplejwt',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in WEB_EXCLUDED_APPS]
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if not middleware.startswith('corsheaders.')]
+REST_FRAMEWORK = {}
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import worker_index
+from .models import CustomUser, WorkerProfile
+
+
+@receiver(post_save, sender=WorkerProfile, dispatch_uid="autocomplete_worker_saved")
+def worker_profile_saved(sender, instance, update_fields=None, **kwargs):
+    # Status changes (update_worker_status) don't touch any suggested term.
+    if update_fields is not None and not {"service_type", "location"} & set(update_fields):
+        return
+    worker_index.update_worker(instance)
+
+
+@receiver(post_delete, sender=WorkerProfile, dispatch_uid="autocomplete_worker_deleted")
+def worker_profile_deleted(sender, instance, **kwargs):
+    worker_index.remove_worker(instance.pk)
+
+
+@receiver(post_save, sender=CustomUser, dispatch_uid="autocomplete_user_saved")
+def worker_user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Only username changes and deactivation (account deletion) affect the
+    # suggestions; in particular, skip the last_login update on every login.
+    if created or instance.role != "worker":
+        return
+    if update_fields is not None and not {"username", "is_active"} & set(update_fields):
+        return
+    profile = WorkerProfile.objects.filter(user=instance).first()
+    if profile is not None:
+        profile.user = instance
+        worker_index.update_worker(profile)
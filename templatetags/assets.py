@@ -0,0 +1,18 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from ..assets import CSS_BUNDLES, bundle_path
+
+register = template.Library()
+
+
+@register.simple_tag
+def css_bundle(name):
+    """Link the minified bundle for ``name``, or its source files while developing."""
+    if getattr(settings, "ASSET_BUNDLES", not settings.DEBUG):
+        paths = [bundle_path(name)]
+    else:
+        paths = CSS_BUNDLES[name]
+    return format_html_join("\n", '<link rel="stylesheet" href="{}">', ((static(path),) for path in paths))
@@ -1,3 +1,411 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .archive import archive_old_bookings, with_avg_rating, worker_avg_rating
+from .autocomplete import GENERATION_KEY, PrefixIndex, WorkerAutocomplete, worker_index, worker_terms
+from . import events
+from .deletion import schedule_user_deletion
+from .events import EventBuffer, event_buffer, iter_events, record_booking_event, replay_booking
+from .models import ArchivedBooking, Booking, BookingEvent, CustomerProfile, DeletionJob, Feedback, WorkerProfile
+from .pricing import DEMAND_CAP, demand_factors, quote, quote_many, time_factor
+
+User = get_user_model()
+
+
+# Tests run with DEBUG off, where the manifest storage needs collected files, and
+# shouldn't share the file-based cache with a running server.
+@override_settings(
+    STORAGES={**settings.STORAGES, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}},
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class WorkerCustomerTestCase(TestCase):
+    """A worker and a customer, both with profiles."""
+
+    def setUp(self):
+        cache.clear()
+        self.worker = User.objects.create_user("plumber_joe", password="pass", role="worker")
+        self.profile = WorkerProfile.objects.create(
+            user=self.worker, service_type="Plumber", location="Kochi", hourly_rate=100
+        )
+        self.customer = User.objects.create_user("customer_ann", password="pass", role="customer")
+        CustomerProfile.objects.create(user=self.customer)
+
+
+class PurgeDeletedAccountsTests(WorkerCustomerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.booking_ids = []
+        for i in range(5):
+            booking = Booking.objects.create(
+                worker=self.worker, customer=self.customer, service="Leak", date=timezone.now(), status="completed"
+            )
+            if i % 2:
+                Feedback.objects.create(booking=booking, rating=4)
+            self.booking_ids.append(booking.id)
+
+    def purge(self, **options):
+        call_command("purge_deleted_accounts", batch_size=2, stdout=StringIO(), **options)
+
+    def test_scheduling_deactivates_and_hides_worker(self):
+        schedule_user_deletion(self.worker)
+        self.worker.refresh_from_db()
+        self.assertFalse(self.worker.is_active)
+        self.assertEqual(DeletionJob.objects.get(user_id=self.worker.pk).status, "pending")
+        self.assertEqual(Booking.objects.count(), 5)
+        self.assertNotContains(self.client.get(reverse("home")), "plumber_joe")
+
+    def test_purge_resumes_after_max_batches(self):
+        schedule_user_deletion(self.worker)
+
+        self.purge(max_batches=2)
+        job = DeletionJob.objects.get(user_id=self.worker.pk)
+        self.assertEqual(job.status, "running")
+        self.assertEqual(job.bookings_purged, 4)
+        self.assertEqual(job.last_booking_id, self.booking_ids[3])
+        self.assertEqual(list(Booking.objects.values_list("id", flat=True)), self.booking_ids[4:])
+        self.assertTrue(User.objects.filter(pk=self.worker.pk).exists())
+
+        self.purge()
+        job.refresh_from_db()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.bookings_purged, 5)
+        self.assertIsNotNone(job.completed_at)
+        self.assertFalse(Booking.objects.exists())
+        self.assertFalse(Feedback.objects.exists())
+        self.assertFalse(WorkerProfile.objects.exists())
+        self.assertFalse(User.objects.filter(pk=self.worker.pk).exists())
+        self.assertTrue(User.objects.filter(pk=self.customer.pk).exists())
+
+    def test_purge_is_idempotent_once_done(self):
+        schedule_user_deletion(self.worker)
+        self.purge()
+        self.purge()
+        job = DeletionJob.objects.get(user_id=self.worker.pk)
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.bookings_purged, 5)
+
+
+class BookingArchiveTests(WorkerCustomerTestCase):
+    def book(self, service, days_ago, status="completed", rating=None):
+        booking = Booking.objects.create(
+            worker=self.worker,
+            customer=self.customer,
+            service=service,
+            date=timezone.now() - timedelta(days=days_ago),
+            status=status,
+        )
+        if rating is not None:
+            Feedback.objects.create(booking=booking, rating=rating, comment=f"{service} review")
+        return booking
+
+    def test_archive_keeps_feedback_and_ratings(self):
+        old = self.book("Old leak", 200, rating=5)
+        self.book("Old drain", 150, status="cancelled")
+        self.book("Recent tap", 5, rating=2)
+        self.book("Old but open", 200, status="pending")
+        rating_before = worker_avg_rating(self.worker)
+
+        self.assertEqual(archive_old_bookings(), 2)
+
+        archived = ArchivedBooking.objects.get(id=old.id)
+        self.assertEqual(archived.feedback_rating, 5)
+        self.assertEqual(archived.feedback_comment, "Old leak review")
+        self.assertEqual(archived.service, "Old leak")
+        self.assertFalse(Booking.objects.filter(id=old.id).exists())
+        self.assertEqual(Feedback.objects.count(), 1)
+        self.assertTrue(Booking.objects.filter(service="Old but open").exists())
+        self.assertEqual(worker_avg_rating(self.worker), rating_before)
+        profile = with_avg_rating(WorkerProfile.objects.all()).get()
+        self.assertAlmostEqual(profile.avg_rating, rating_before)
+
+    def test_finished_booking_visible_before_and_after_archiving(self):
+        self.book("Ancient repair", 200)
+        self.client.force_login(self.customer)
+        dashboard = reverse("customer_dashboard")
+        history = reverse("booking_history")
+
+        # Not archived yet: still in the hot table, so the dashboard shows it.
+        self.assertContains(self.client.get(dashboard), "Ancient repair")
+        self.assertNotContains(self.client.get(history), "Ancient repair")
+
+        archive_old_bookings()
+        self.assertNotContains(self.client.get(dashboard), "Ancient repair")
+        self.assertContains(self.client.get(history), "Ancient repair")
+
+    def test_worker_history_reads_archive(self):
+        self.book("Ancient repair", 200)
+        archive_old_bookings()
+        self.client.force_login(self.worker)
+        self.assertNotContains(self.client.get(reverse("worker_dashboard")), "customer_ann")
+        self.assertContains(self.client.get(reverse("booking_history")), "customer_ann")
+
+
+# Monday 2026-10-19 is the first day of this week.
+WEDNESDAY_NOON = datetime(2026, 10, 21, 12, tzinfo=dt_timezone.utc)
+SATURDAY_NIGHT = datetime(2026, 10, 24, 21, tzinfo=dt_timezone.utc)
+SUNDAY_LATE = datetime(2026, 10, 25, 23, tzinfo=dt_timezone.utc)
+
+
+class PricingTests(WorkerCustomerTestCase):
+    def add_worker(self, username, hourly_rate=100, is_active=True):
+        user = User.objects.create_user(username, password="pass", role="worker", is_active=is_active)
+        return WorkerProfile.objects.create(
+            user=user, service_type="Plumber", location="Kochi", hourly_rate=hourly_rate
+        )
+
+    def add_pending(self, worker, count):
+        for _ in range(count):
+            Booking.objects.create(worker=worker, customer=self.customer, service="Leak", date=WEDNESDAY_NOON)
+
+    def test_night_and_weekend_multipliers_stack(self):
+        self.assertEqual(time_factor(WEDNESDAY_NOON, 1), Decimal(1))
+        self.assertEqual(time_factor(WEDNESDAY_NOON.replace(hour=21), 1), Decimal("1.25"))
+        self.assertEqual(time_factor(SATURDAY_NIGHT.replace(hour=12), 1), Decimal("1.20"))
+        self.assertEqual(time_factor(SATURDAY_NIGHT, 1), Decimal("1.5"))
+
+    def test_time_factor_wraps_sunday_into_monday(self):
+        # Sunday 23:00 is night and weekend, Monday 00:00 night only.
+        self.assertEqual(time_factor(SUNDAY_LATE, 2), Decimal("2.75"))
+
+    def test_quote_applies_time_and_demand(self):
+        self.add_worker("plumber_raj")
+        self.add_pending(self.worker, 3)
+
+        price = quote(self.profile, SATURDAY_NIGHT, 3)
+
+        self.assertEqual(price.time_factor, Decimal("4.5"))
+        self.assertEqual(price.demand_factor, Decimal("1.15"))
+        self.assertEqual(price.total, Decimal("517.50"))
+
+    def test_demand_is_capped(self):
+        self.add_pending(self.worker, 20)
+        self.assertEqual(demand_factors()[("plumber", "kochi")], DEMAND_CAP)
+
+    def test_demand_ignores_inactive_workers(self):
+        retired = self.add_worker("plumber_old", is_active=False)
+        self.add_pending(retired.user, 5)
+        self.assertEqual(demand_factors(), {})
+
+    def test_quote_many_clamps_hours_and_skips_unpriced_workers(self):
+        unpriced = self.add_worker("plumber_free", hourly_rate=None)
+
+        quotes = quote_many([self.profile, unpriced], WEDNESDAY_NOON, hours=1000)
+
+        self.assertEqual(list(quotes), [self.profile.id])
+        self.assertEqual(quotes[self.profile.id].hours, 24)
+        self.assertEqual(quote_many([self.profile], WEDNESDAY_NOON, hours=0)[self.profile.id].hours, 1)
+
+    def test_quote_view(self):
+        url = reverse("booking_quote", args=[self.profile.id])
+        response = self.client.get(url, {"date": "2026-10-24T21:00", "hours": 3})
+        self.assertEqual(response.json()["total"], "450.00")
+
+    @mock.patch("django.utils.timezone.now", return_value=WEDNESDAY_NOON)
+    def test_quote_view_falls_back_on_bad_input(self, now):
+        url = reverse("booking_quote", args=[self.profile.id])
+
+        impossible = self.client.get(url, {"date": "2026-13-45T21:00", "hours": 3}).json()
+        self.assertEqual((impossible["time_factor"], impossible["total"]), ("3", "300.00"))
+
+        self.assertEqual(self.client.get(url, {"hours": "many"}).json()["hours"], 1)
+        self.assertEqual(self.client.get(url, {"hours": 1000}).json()["hours"], 24)
+
+    def test_create_booking_stores_quote(self):
+        self.client.force_login(self.customer)
+        self.client.post(
+            reverse("create_booking", args=[self.profile.id]),
+            {"service": "Burst pipe", "date": "2026-10-24T21:00", "duration_hours": 3},
+        )
+        self.assertEqual(Booking.objects.get(service="Burst pipe").quoted_total, Decimal("450.00"))
+
+
+def labels(suggestions):
+    return [suggestion["label"] for suggestion in suggestions]
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def test_shared_term_is_reference_counted(self):
+        index = PrefixIndex()
+        index.set_worker(1, worker_terms("Plumber", "Kochi", "joe"))
+        index.set_worker(2, worker_terms("plumber", "Kochi", "raj"))
+
+        index.remove_worker(1)
+        self.assertEqual(labels(index.search("plu")), ["Plumber"])
+
+        index.remove_worker(2)
+        self.assertEqual(index.search("plu"), [])
+        self.assertEqual(len(index), 0)
+
+    def test_max_terms_caps_new_terms_only(self):
+        index = PrefixIndex(max_terms=3)
+        index.set_worker(1, worker_terms("Plumber", "Kochi", "joe"))
+        index.set_worker(2, worker_terms("Plumber", "Delhi", "raj"))
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.search("delhi"), [])
+        # Already indexed terms still count, so Plumber outlives worker 1.
+        index.remove_worker(1)
+        self.assertEqual(labels(index.search("plumber")), ["Plumber"])
+
+    def test_search_is_casefolded_and_most_used_first(self):
+        index = PrefixIndex()
+        index.set_worker(1, worker_terms("Painter", "Kochi", "joe"))
+        index.set_worker(2, worker_terms("Plumber", "Kochi", "raj"))
+        index.set_worker(3, worker_terms("Plumber", "Kochi", "ann"))
+
+        self.assertEqual(labels(index.search("  P ")), ["Plumber", "Painter"])
+        self.assertEqual(labels(index.search("KOCH")), ["Kochi"])
+        self.assertEqual(index.search("   "), [])
+
+    def test_set_worker_reports_unchanged_terms(self):
+        index = PrefixIndex()
+        self.assertTrue(index.set_worker(1, worker_terms("Plumber", "Kochi", "joe")))
+        self.assertFalse(index.set_worker(1, worker_terms("Plumber", " Kochi ", "joe")))
+        self.assertTrue(index.set_worker(1, worker_terms("Plumber", "Delhi", "joe")))
+
+
+class WorkerAutocompleteTests(WorkerCustomerTestCase):
+    def setUp(self):
+        super().setUp()
+        worker_index.index = worker_index.generation = None
+
+    def save(self, instance, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.save(**kwargs)
+
+    def test_profile_rename_updates_suggestions(self):
+        self.assertIn("Plumber", labels(worker_index.suggest("plu")))
+
+        self.profile.service_type = "Electrician"
+        self.save(self.profile)
+
+        self.assertNotIn("Plumber", labels(worker_index.suggest("plu")))
+        self.assertEqual(labels(worker_index.suggest("elec")), ["Electrician"])
+
+    def test_deactivation_removes_worker(self):
+        self.assertEqual(labels(worker_index.suggest("plumber_")), ["plumber_joe"])
+
+        self.worker.is_active = False
+        self.save(self.worker)
+
+        self.assertEqual(worker_index.suggest("plu"), [])
+
+    def test_other_processes_rebuild_after_a_change(self):
+        other = WorkerAutocomplete()
+        self.assertIn("Plumber", labels(other.suggest("plu")))
+
+        self.profile.location = "Delhi"
+        self.save(self.profile)
+        other.checked_at = 0  # as if SYNC_INTERVAL had passed
+
+        self.assertEqual(labels(other.suggest("del")), ["Delhi"])
+
+    def test_unchanged_terms_dont_bump_generation(self):
+        worker_index.suggest("plu")
+        generation = cache.get(GENERATION_KEY)
+
+        self.profile.status = "busy"
+        self.save(self.profile, update_fields=["status"])
+        self.profile.hourly_rate = 150
+        self.save(self.profile)
+
+        self.assertEqual(cache.get(GENERATION_KEY), generation)
+
+    def test_autocomplete_view(self):
+        url = reverse("worker_autocomplete")
+        response = self.client.get(url, {"q": "Koc"})
+        self.assertEqual(response.json(), {"query": "Koc", "suggestions": [{"label": "Kochi", "kind": "location"}]})
+        self.assertEqual(self.client.get(url, {"q": " "}).json()["suggestions"], [])
+
+
+# Flushes happen synchronously in these tests instead of on the background thread.
+@mock.patch.object(EventBuffer, "_ensure_thread")
+class BookingEventTests(WorkerCustomerTestCase):
+    def setUp(self):
+        super().setUp()
+        event_buffer.flush()
+        self.addCleanup(event_buffer.flush)
+
+    def event(self, to_status="pending"):
+        return BookingEvent(booking_id=1, to_status=to_status, created_at=timezone.now())
+
+    def test_event_is_queued_on_commit(self, ensure_thread):
+        booking = Booking.objects.create(
+            worker=self.worker, customer=self.customer, service="Leak", date=SATURDAY_NIGHT
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            record_booking_event(booking, self.customer)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(event_buffer.flush(), 0)
+
+        callbacks[0]()
+        self.assertEqual(event_buffer.flush(), 1)
+        event = BookingEvent.objects.get()
+        self.assertEqual(
+            (event.booking_id, event.actor_id, event.worker_id, event.customer_id, event.service),
+            (booking.id, self.customer.id, self.worker.id, self.customer.id, "Leak"),
+        )
+        self.assertEqual((event.from_status, event.to_status, event.scheduled_for), ("", "pending", SATURDAY_NIGHT))
+
+    def test_failed_flush_requeues_and_trims_oldest(self, ensure_thread):
+        buffer = EventBuffer()
+        oldest = self.event("pending")
+        buffer.append(oldest)
+        buffer.append(self.event("confirmed"))
+        with mock.patch.object(events, "MAX_BUFFERED", 3), \
+                mock.patch.object(BookingEvent.objects, "bulk_create", side_effect=DatabaseError), \
+                self.assertLogs(events.logger, "ERROR"):
+            self.assertEqual(buffer.flush(), 0)
+            buffer.append(self.event("completed"))
+            buffer.append(self.event("cancelled"))
+            self.assertEqual(buffer.flush(), 0)
+
+        self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(
+            list(BookingEvent.objects.order_by("id").values_list("to_status", flat=True)),
+            ["confirmed", "completed", "cancelled"],
+        )
+
+    def test_replay_follows_booking_lifecycle(self, ensure_thread):
+        self.client.force_login(self.customer)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("create_booking", args=[self.profile.id]),
+                {"service": "Burst pipe", "date": "2026-10-24T21:00", "duration_hours": 2},
+            )
+        booking = Booking.objects.get()
+        self.client.force_login(self.worker)
+        for view in ("accept_booking", "complete_booking"):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse(view, args=[booking.id]))
+        event_buffer.flush()
+
+        state = replay_booking(booking.id)
+
+        self.assertEqual(state["status"], "completed")
+        self.assertEqual((state["created_by"], state["updated_by"]), (self.customer.id, self.worker.id))
+        self.assertEqual((state["worker_id"], state["customer_id"]), (self.worker.id, self.customer.id))
+        self.assertEqual((state["service"], state["scheduled_for"]), ("Burst pipe", SATURDAY_NIGHT))
+        self.assertEqual(
+            [(from_status, to_status) for _, _, from_status, to_status in state["history"]],
+            [("", "pending"), ("pending", "confirmed"), ("confirmed", "completed")],
+        )
+        self.assertIsNone(replay_booking(booking.id + 1))
+
+    def test_iter_events_resumes_after_id(self, ensure_thread):
+        BookingEvent.objects.bulk_create([self.event() for _ in range(5)])
+        ids = [event.id for event in iter_events(batch_size=2)]
+
+        self.assertEqual(len(ids), 5)
+        self.assertEqual([event.id for event in iter_events(after_id=ids[2], batch_size=2)], ids[3:])
@@ -15,15 +15,17 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
-from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from core import views
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/bookings/history/', views.booking_history, name='booking_history'),
+    path('api/search/autocomplete/', views.worker_autocomplete, name='worker_autocomplete'),
+    path('api/workers/<int:worker_id>/quote/', views.booking_quote, name='booking_quote'),
     path('api/', include('core.urls')),
 ] 
 urlpatterns+=static(settings.MEDIA_URL,document_root=settings.MEDIA_ROOT)
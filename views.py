@@ -4,40 +4,60 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.db.models import Q
 from django.conf import settings
-from django.db.models import Avg
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 import logging
-from django.core.mail import send_mail, BadHeaderError
-from smtplib import SMTPException
-from .forms import *  
-from .models import *
+from .forms import (
+    CustomUserCreationForm, LoginForm, WorkerProfileForm, BookingForm, FeedbackForm, CustomerProfileForm,
+)
+from .models import WorkerProfile, CustomerProfile, Booking, Feedback, ArchivedBooking
+from .deletion import schedule_user_deletion
+from .archive import active_bookings, with_avg_rating, worker_avg_rating
+from .autocomplete import worker_index
+from .events import record_booking_event
+from .pricing import quote, quote_many
 User = get_user_model()
 
 # Home + Search
 def home(request):
     query = request.GET.get("q", "")
-    workers = WorkerProfile.objects.all().annotate(
-        avg_rating=Avg("user__bookings__feedback__rating")
-    )
+    workers = with_avg_rating(WorkerProfile.objects.filter(user__is_active=True))
     if query:
         workers = workers.filter(
             Q(user__username__icontains=query) |
             Q(service_type__icontains=query) |
             Q(location__icontains=query)
         )
+    workers = list(workers)
+    quotes = quote_many(workers)
+    for worker in workers:
+        worker.quote = quotes.get(worker.id)
     return render(request, 'home.html', {'workers': workers, 'query': query})
 
 
 def search_workers(request):
     query = request.GET.get("q", "")
-    workers = WorkerProfile.objects.all()
+    workers = WorkerProfile.objects.filter(user__is_active=True)
     if query:
         workers = workers.filter(
             Q(user__username__icontains=query)
             | Q(service_type__icontains=query)
             | Q(location__icontains=query)
         )
+    workers = list(workers)
+    quotes = quote_many(workers)
+    for worker in workers:
+        worker.quote = quotes.get(worker.id)
     return render(request, "searchresults.html", {"workers": workers, "query": query})
 
+
+def worker_autocomplete(request):
+    query = request.GET.get("q", "")
+    suggestions = worker_index.suggest(query) if query.strip() else []
+    return JsonResponse({"query": query, "suggestions": suggestions})
+
 # Register
 def register(request):
     if request.method == 'POST':
@@ -92,9 +112,7 @@ def worker_profile(request):
             "status": "available",
         }
     )
-    avg_rating = Feedback.objects.filter(booking__worker=profile.user).aggregate(
-        Avg("rating")
-    )["rating__avg"]
+    avg_rating = worker_avg_rating(profile.user)
     if request.method == "POST":
         form = WorkerProfileForm(request.POST, request.FILES, instance=profile)
         if form.is_valid():
@@ -139,8 +157,17 @@ def worker_dashboard(request):
         messages.error(request, "Only workers can access the dashboard.")
         return redirect("home")
     profile = WorkerProfile.objects.filter(user=request.user).first()
-    jobs = Booking.objects.filter(worker=request.user).order_by("-date")
-    return render(request, "workerdashboard.html", {"profile": profile, "jobs": jobs})
+    jobs = active_bookings(worker=request.user).select_related("customer").order_by("-date")
+    feedbacks = (
+        Feedback.objects.filter(booking__in=active_bookings(worker=request.user))
+        .select_related("booking__customer")
+        .order_by("-booking__date")
+    )
+    return render(
+        request,
+        "workerdashboard.html",
+        {"profile": profile, "jobs": jobs, "feedbacks": feedbacks},
+    )
 
 @login_required
 def update_worker_status(request):
@@ -149,7 +176,7 @@ def update_worker_status(request):
         new_status = request.POST.get("status")
         if new_status:
             profile.status = new_status
-            profile.save()
+            profile.save(update_fields=["status"])
             messages.success(request, f"Status updated to {profile.status}")
     return redirect("worker_dashboard")
 
@@ -173,16 +200,20 @@ def delete_worker_profile(request):
 @login_required
 def accept_booking(request, booking_id):
     booking = get_object_or_404(Booking, id=booking_id, worker=request.user)
+    previous_status = booking.status
     booking.status = "confirmed"
     booking.save()
+    record_booking_event(booking, request.user, previous_status)
     messages.success(request, "Booking accepted successfully.")
     return redirect("worker_dashboard")
 
 @login_required
 def reject_booking(request, booking_id):
     booking = get_object_or_404(Booking, id=booking_id, worker=request.user)
+    previous_status = booking.status
     booking.status = "cancelled"
     booking.save()
+    record_booking_event(booking, request.user, previous_status)
     messages.success(request, "Booking rejected.")
     return redirect("worker_dashboard")
 
@@ -192,6 +223,7 @@ def complete_booking(request, booking_id):
     if booking.status == "confirmed":
         booking.status = "completed"
         booking.save()
+        record_booking_event(booking, request.user, "confirmed")
         messages.success(request, "Booking marked as completed.")
     else:
         messages.error(request, "Only confirmed bookings can be completed.")
@@ -204,9 +236,27 @@ def customer_dashboard(request):
         messages.error(request, "Only customers can access this page.")
         return redirect("home")
     profile, created = CustomerProfile.objects.get_or_create(user=request.user)
-    bookings = Booking.objects.filter(customer=request.user).select_related("worker")
+    bookings = (
+        active_bookings(customer=request.user)
+        .select_related("worker", "feedback")
+        .order_by("-date")
+    )
     return render(request, "customerdashboard.html", {"profile": profile, "bookings": bookings})
 
+@login_required
+def booking_history(request):
+    if request.user.role == "customer":
+        bookings = ArchivedBooking.objects.filter(customer=request.user).select_related("worker")
+        dashboard = "customer_dashboard"
+    elif request.user.role == "worker":
+        bookings = ArchivedBooking.objects.filter(worker=request.user).select_related("customer")
+        dashboard = "worker_dashboard"
+    else:
+        messages.error(request, "Only customers and workers have a booking history.")
+        return redirect("home")
+    page_obj = Paginator(bookings.order_by("-date"), 20).get_page(request.GET.get("page"))
+    return render(request, "bookinghistory.html", {"page_obj": page_obj, "dashboard": dashboard})
+
 @login_required
 def customer_profile(request):
     profile, created = CustomerProfile.objects.get_or_create(user=request.user)
@@ -247,14 +297,20 @@ def worker_view_customer_profile(request, customer_id):
 logger = logging.getLogger(__name__)  
 @login_required
 def create_booking(request, worker_id):
-    worker = get_object_or_404(WorkerProfile, id=worker_id)
+    worker = get_object_or_404(WorkerProfile, id=worker_id, user__is_active=True)
     if request.method == "POST":
         form = BookingForm(request.POST)
         if form.is_valid():
             booking = form.save(commit=False)
             booking.customer = request.user
             booking.worker = worker.user
+            booking_quote = quote(worker, booking.date, booking.duration_hours)
+            booking.quoted_total = booking_quote.total if booking_quote else None
             booking.save()
+            record_booking_event(booking, request.user)
+            # Imported here: smtplib is only needed when a booking is actually made.
+            from django.core.mail import send_mail, BadHeaderError
+            from smtplib import SMTPException
             try:
                 subject = "New Booking Confirmation"
                 message = f"""
@@ -262,6 +318,8 @@ def create_booking(request, worker_id):
                 You have a new booking request!
                 Service: {booking.service}
                 Date: {booking.date}
+                Duration: {booking.duration_hours} hour(s)
+                Estimated total: ₹{booking.quoted_total or "-"}
                 Customer: {request.user.username}
                 Location: {request.user.location}
                 Please log in to your dashboard to accept/reject.
@@ -280,7 +338,35 @@ def create_booking(request, worker_id):
             return redirect("customer_dashboard")
     else:
         form = BookingForm()
-    return render(request, "createbooking.html", {"form": form, "worker": worker})
+    return render(
+        request,
+        "createbooking.html",
+        {"form": form, "worker": worker, "quote": quote(worker)},
+    )
+
+def booking_quote(request, worker_id):
+    worker = get_object_or_404(WorkerProfile, id=worker_id, user__is_active=True)
+    try:
+        start = parse_datetime(request.GET.get("date", "")) or timezone.now()
+    except ValueError:
+        # Well-formed but impossible dates, e.g. 2026-13-45T21:00.
+        start = timezone.now()
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    try:
+        hours = int(request.GET.get("hours", 1))
+    except ValueError:
+        hours = 1
+    price = quote(worker, start, hours)
+    if price is None:
+        return JsonResponse({"total": None})
+    return JsonResponse({
+        "rate": str(price.rate),
+        "hours": price.hours,
+        "time_factor": str(price.time_factor),
+        "demand_factor": str(price.demand_factor),
+        "total": str(price.total),
+    })
 
 @login_required
 def cancel_booking(request, booking_id):
@@ -288,8 +374,10 @@ def cancel_booking(request, booking_id):
     if booking.status == "cancelled":
         messages.info(request, "This booking is already cancelled.")
     else:
+        previous_status = booking.status
         booking.status = "cancelled"
         booking.save()
+        record_booking_event(booking, request.user, previous_status)
         messages.success(request, "Your booking has been cancelled.")
     return redirect("customer_dashboard")
 
@@ -317,7 +405,7 @@ def delete_user(request, user_id):
     if user.is_superuser:
         messages.error(request, "You cannot delete a superuser.")
     else:
-        user.delete()
+        schedule_user_deletion(user)
         messages.success(request, "User deleted successfully.")
     return redirect("home")
 
@@ -325,9 +413,7 @@ def delete_user(request, user_id):
 @user_passes_test(lambda u: u.is_superuser or u.role == "admin")
 def delete_worker(request, worker_id):
     worker = get_object_or_404(WorkerProfile, id=worker_id)
-    user = worker.user
-    worker.delete()
-    user.delete()
+    schedule_user_deletion(worker.user)
     messages.success(request, "Worker deleted successfully.")
     return redirect("home")
 
@@ -10,7 +10,23 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.template.loader import get_template
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
+
+def warm_up():
+    """Load the URLconf (and so every view) and compile the busiest templates.
+
+    Under `gunicorn --preload` (see gunicorn.conf.py) this module is imported
+    once in the master and every forked worker inherits the result, instead of
+    paying for it on each worker's first request. Neither touches the database.
+    """
+    get_resolver().url_patterns
+    for template_name in ('base.html', 'home.html', 'searchresults.html'):
+        get_template(template_name)
+
+
 application = get_wsgi_application()
+warm_up()